@@ -5,26 +5,46 @@
 """
 
 import os
+import sys
 import time
+import atexit
+import queue
 import logging
 import json
-from logging.handlers import RotatingFileHandler
+import threading
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
 import numpy as np
 import cv2
 import PySpin
 
 from PySide6.QtCore import (
     QObject, Signal, Property, QThread, 
-    Slot, QMutex, QMutexLocker, QUrl
+    Slot, QMutex, QMutexLocker, QUrl, QRectF, QTimer, QThreadPool
 )
 from PySide6.QtGui import QImage, QColor
-from PySide6.QtQuick import QQuickImageProvider
+try:
+    import orjson  # Необязательная зависимость: более быстрая (де)сериализация пресетов
+except ImportError:
+    orjson = None
+
+try:
+    # Необязательная зависимость: SIMD-кодер libjpeg-turbo для снимков
+    from turbojpeg import TurboJPEG, TJPF_GRAY, TJPF_RGB, TJPF_BGR, TJPF_RGBA, TJSAMP_GRAY
+    _turbo = TurboJPEG()
+except (ImportError, OSError, RuntimeError):
+    _turbo = None
+
+from PySide6.QtQuick import QQuickImageProvider, QQuickItem, QQuickWindow, QSGSimpleTextureNode, QSGTexture
 
 
 def setup_logger():
-    """Настройка системы логирования с ротацией файлов (ограничение размера лога)."""
+    """
+    Настройка системы логирования с ротацией файлов (ограничение размера лога).
+    Запись в консоль и файл выполняет фоновый QueueListener: поток камеры
+    только кладет запись в очередь и не ждет дискового ввода-вывода.
+    """
     logger = logging.getLogger("FLIR_System")
-    logger.setLevel(logging.DEBUG)
+    logger.setLevel(logging.INFO)
     formatter = logging.Formatter('%(asctime)s - %(levelname)s - [%(filename)s:%(lineno)d] - %(message)s')
     
     console_handler = logging.StreamHandler()
@@ -33,38 +53,201 @@ def setup_logger():
     
     log_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), "camera_debug.log")
     file_handler = RotatingFileHandler(log_file, maxBytes=5*1024*1024, backupCount=3, encoding='utf-8')
-    file_handler.setLevel(logging.DEBUG)
+    # DEBUG в файл на частоте кадров дает мегабайты в минуту; включается только вручную
+    file_handler.setLevel(logging.INFO)
     file_handler.setFormatter(formatter)
 
+    # SimpleQueue: put() без Condition и учета task_done — самый дешевый вызов в потоке камеры
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, console_handler, file_handler, respect_handler_level=True)
+    listener.start()
+    # Остановка слушателя дописывает очередь на диск при выходе из приложения
+    atexit.register(listener.stop)
+
     if logger.hasHandlers(): logger.handlers.clear()
-    logger.addHandler(console_handler)
-    logger.addHandler(file_handler)
+    logger.addHandler(QueueHandler(log_queue))
     return logger
 
 logger = setup_logger()
+logger.info("Кодер JPEG для снимков: %s", "libjpeg-turbo (PyTurboJPEG)" if _turbo else "OpenCV imencode")
+
+# Окно усреднения телеметрии FPS (1 секунда в наносекундах)
+FPS_WINDOW_NS = 1_000_000_000
+
+# Период программного автобаланса белого (1.5 секунды в наносекундах)
+AWB_INTERVAL_NS = 1_500_000_000
+
+# Выравнивание строк кадра в байтах (кэш-линия / ширина AVX-512)
+ALIGN = 64
 
 
 class LiveImageProvider(QQuickImageProvider):
     """
-    Провайдер изображений для QML. 
-    Использует QMutex для защиты разделяемой памяти между потоком камеры и потоком GUI.
+    Провайдер изображений для QML.
+    Хранит кольцо из трех кадров (тройная буферизация) с одним писателем (поток камеры)
+    и одним читателем (поток GUI/рендера). Писатель никогда не трогает слот,
+    опубликованный последним или отданный читателю; передача индексов идет под
+    коротким замком (без копирования пикселей), чтобы чтение _latest и отметка
+    _reading не разделялись выбором слота для записи.
     """
+    SLOT_COUNT = 3
+
     def __init__(self):
         super().__init__(QQuickImageProvider.ImageType.Image)
-        self._current_image = QImage(800, 600, QImage.Format_RGB888)
-        self._current_image.fill(QColor("black"))
-        self.mutex = QMutex()
+        self._placeholder = QImage(800, 600, QImage.Format_RGB888)
+        self._placeholder.fill(QColor("black"))
+
+        self._storage = []      # Плоская память слотов (numpy), живет вместе с провайдером
+        self._buffers = []      # Представления памяти слотов под текущую форму кадра
+        self._images = []       # QImage-обертки над памятью слотов (без копирования)
+        self._shape = None
+        self._stride = 0        # Байт на строку слота (кратно ALIGN)
+        self._retired = None    # Предыдущее поколение памяти, пока GUI может на него ссылаться
+        self._latest = -1       # Индекс последнего опубликованного кадра
+        self._reading = -1      # Индекс кадра, отданного GUI
+        self._write_idx = 0
+        self._lock = threading.Lock()  # Передача индексов latest/reading между потоками
 
     def requestImage(self, id, size, requestedSize):
         """Вызывается QML-движком при обновлении источника (source)."""
-        with QMutexLocker(self.mutex):
-            return self._current_image
-            
-    def update_image(self, image):
-        """Вызывается из CameraController для загрузки нового кадра."""
-        with QMutexLocker(self.mutex):
-            if not image.isNull():
-                self._current_image = image
+        image = self.latest_image()
+        return image if image is not None else self._placeholder
+
+    def latest_image(self):
+        """Последний опубликованный кадр (слот помечается как занятый читателем) или None."""
+        with self._lock:
+            idx = self._latest
+            if idx < 0:
+                return None
+            self._reading = idx
+            return self._images[idx]
+
+    def acquire_frame_buffer(self, shape):
+        """Вызывается из потока камеры: возвращает свободный слот для записи следующего кадра."""
+        with self._lock:
+            return self._acquire_locked(shape)
+
+    def _acquire_locked(self, shape):
+        if self._shape != shape:
+            # Сначала снимаем публикацию, затем подменяем слоты
+            self._latest = -1
+            h = shape[0]
+            row_bytes = int(np.prod(shape[1:]))
+            # Строки выравниваются на 64 байта (кэш-линия): SIMD-ядра OpenCV и загрузка
+            # текстуры работают с выровненными строками без скалярного хвоста
+            stride = (row_bytes + ALIGN - 1) // ALIGN * ALIGN
+            size = h * stride
+            # Память выделяется заново только при росте кадра: переключение
+            # Mono8 <-> BayerRG8 на том же разрешении переиспользует те же слоты
+            if not self._storage or self._storage[0].size < size:
+                self._retired = (self._storage, self._images)
+                self._storage = [self._aligned_empty(size) for _ in range(self.SLOT_COUNT)]
+            self._buffers = [buf[:size].reshape(h, stride)[:, :row_bytes].reshape(shape) for buf in self._storage]
+            self._images = [None] * self.SLOT_COUNT
+            self._stride = stride
+            self._shape = shape
+
+        busy = (self._latest, self._reading)
+        self._write_idx = next(i for i in range(self.SLOT_COUNT) if i not in busy)
+        return self._buffers[self._write_idx]
+
+    @staticmethod
+    def _aligned_empty(size):
+        """Неинициализированный буфер uint8, начало которого выровнено на ALIGN байт."""
+        raw = np.empty(size + ALIGN, np.uint8)
+        offset = -raw.ctypes.data % ALIGN
+        return raw[offset:offset + size]
+
+    def publish(self, qformat):
+        """Вызывается из потока камеры: делает записанный слот доступным для QML."""
+        idx = self._write_idx
+        image = self._images[idx]
+        if image is None or image.format() != qformat:
+            # Представление с отступами строк не C-непрерывно, поэтому QImage строится
+            # над непрерывной памятью слота с шагом строки stride
+            h, w = self._shape[:2]
+            stride = self._stride
+            self._images[idx] = QImage(self._storage[idx][:h * stride].data, w, h, stride, qformat)
+        with self._lock:
+            self._latest = idx
+
+    def snapshot(self):
+        """Глубокая копия последнего кадра (для сохранения снимка)."""
+        # Копия под замком: писатель не получит этот слот, пока она не готова
+        # (снимок редкий, задержка одного кадра допустима)
+        with self._lock:
+            idx = self._latest
+            return self._images[idx].copy() if idx >= 0 else QImage()
+
+
+class LiveView(QQuickItem):
+    """
+    Элемент QML для вывода видеопотока напрямую в scene graph.
+    На каждый новый кадр контроллера загружает последний слот провайдера в текстуру
+    в updatePaintNode, без смены URL и обращения к механизму image provider.
+    """
+    controllerChanged = Signal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setFlag(QQuickItem.ItemHasContents, True)
+        self._controller = None
+        self._dirty = False  # Есть кадр, еще не загруженный в текстуру
+
+    @Property(QObject, notify=controllerChanged)
+    def controller(self): return self._controller
+    @controller.setter
+    def controller(self, val):
+        if self._controller is val: return
+        if self._controller:
+            self._controller.frameChanged.disconnect(self._on_frame)
+        self._controller = val
+        if val:
+            val.frameChanged.connect(self._on_frame)
+        self.controllerChanged.emit()
+        self._on_frame()
+
+    def _on_frame(self):
+        self._dirty = True
+        self.update()
+
+    def geometryChange(self, new_geometry, old_geometry):
+        super().geometryChange(new_geometry, old_geometry)
+        self.update()
+
+    def updatePaintNode(self, node, data):
+        """Вызывается из потока рендеринга: обновляет текстуру последним кадром."""
+        if self._dirty or node is None:
+            provider = self._controller.provider if self._controller else None
+            image = provider.latest_image() if provider else None
+            if image is None or image.isNull():
+                return node
+            self._dirty = False
+
+            if node is None:
+                node = QSGSimpleTextureNode()
+                node.setOwnsTexture(True)
+                node.setFiltering(QSGTexture.Linear)
+            # Кадр камеры непрозрачен: рендерер рисует его без смешивания
+            node.setTexture(self.window().createTextureFromImage(image, QQuickWindow.TextureIsOpaque))
+        # Без нового кадра (изменение размера элемента) текстура не загружается повторно
+
+        # Вписывание кадра с сохранением пропорций (аналог Image.PreserveAspectFit)
+        size = node.texture().textureSize()
+        scale = min(self.width() / size.width(), self.height() / size.height())
+        w, h = size.width() * scale, size.height() * scale
+        node.setRect(QRectF((self.width() - w) / 2, (self.height() - h) / 2, w, h))
+        return node
+
+
+class FrameEventHandler(PySpin.ImageEventHandler):
+    """Обработчик событий Spinnaker: передает каждый полученный кадр в CameraWorker."""
+    def __init__(self, worker):
+        super().__init__()
+        self._worker = worker
+
+    def OnImageEvent(self, image):
+        self._worker.on_image(image)
 
 
 class CameraWorker(QThread):
@@ -73,19 +256,50 @@ class CameraWorker(QThread):
     Инкапсулирует всю логику работы с железом, чтобы не блокировать GUI.
     """
     # Сигналы для общения с контроллером 
-    frame_ready = Signal(QImage)
+    frame_ready = Signal()  # Новый кадр опубликован в провайдере (без передачи данных)
     status_changed = Signal(str)
     error_occurred = Signal(str)
     metrics_updated = Signal(float, float, float, float)
     resolution_updated = Signal(str)
     wb_red_calculated = Signal(float)
 
-    def __init__(self):
+    # Форматы, которые конвертируются без участия ImageProcessor, и формат QImage
+    # для отображения (None — нужна дебайеризация, формат зависит от DEMOSAIC_CODES)
+    NATIVE_FORMATS = {
+        PySpin.PixelFormat_Mono8: QImage.Format_Grayscale8,
+        PySpin.PixelFormat_Mono16: QImage.Format_Grayscale8,
+        PySpin.PixelFormat_BayerRG8: None,
+        PySpin.PixelFormat_BayerRG16: None,
+        PySpin.PixelFormat_RGB8: QImage.Format_RGB888,
+        PySpin.PixelFormat_BGR8: QImage.Format_BGR888,
+    }
+
+    # Алгоритмы дебайеризации на CPU: (код OpenCV, число каналов результата).
+    # Порядок байт на выходе RGB(A), см. _process_frame. bilinear — самый быстрый
+    # SIMD-путь и сразу 4 канала под формат текстуры; ea/vng есть только в 3 каналах
+    DEMOSAIC_CODES = {
+        "bilinear": (cv2.COLOR_BayerRG2BGRA, 4),
+        "ea": (cv2.COLOR_BayerRG2BGR_EA, 3),
+        "vng": (cv2.COLOR_BayerRG2BGR_VNG, 3),
+    }
+
+    def __init__(self, provider):
         super().__init__()
+        self.provider = provider
         self.camera = None
+        self._processor = None
+        self._nodes_cached = False
+        self._buf8 = None  # Буфер понижения 16-битных кадров до 8 бит
+        self._lut16 = None  # Таблица 16 -> 8 бит с гаммой (None — гамма 1.0, хватает сдвига)
+        self._lut_idx = None  # Буфер индексов intp для выборки по таблице полосами строк
+        self._event_handler = None
+        self._thread_pinned = False
+        self._last_awb_ns = 0
         self.system = None
         self.running = False
-        self._lock = QMutex() 
+        self._lock = QMutex()  # Сериализует смену формата (GUI-поток и инициализация)
+        self._reconfiguring = False
+        self._frame_signal_pending = False  # frame_ready уже в очереди событий GUI
         
         # Параметры сенсора по умолчанию
         self.exposure_time = 20000.0
@@ -95,6 +309,17 @@ class CameraWorker(QThread):
         self.wb_auto = False
         self.pixel_format_str = "BayerRG8"
         self.packet_size = 9000
+        self.socket_buffer_size = 20_000_000  # Приемный буфер UDP для потока GigE (байт)
+        # Буферы драйвера: при NewestOnly глубина не добавляет задержки, но дает запас
+        # на всплески пакетов GVSP, пока поток Python вытеснен
+        self.buffer_count = 20
+        self.demosaic_method = "bilinear"
+        self.width_align = 32  # Кратность ширины кадра для выровненных SIMD-проходов
+        # Ядро для потока захвата: не CPU 0, который обслуживает большую часть прерываний
+        self.capture_cpu = 2 if (os.cpu_count() or 1) > 2 else None
+        # Сетевой интерфейс GigE-камеры (например "eth1"): если задан, ядро захвата
+        # выбирается среди CPU, локальных для сетевой карты (Linux)
+        self.nic_interface = None
         
         # Параметры подсистемы записи видео
         self._video_lock = QMutex()
@@ -102,9 +327,32 @@ class CameraWorker(QThread):
         self.video_writer = None
         self.record_path = ""
         self.record_fps = 30.0
+        self._record_buf = None  # Постоянный буфер перестановки RGB -> BGR для записи
+
+        # GPU-дебайеризация (OpenCV CUDA), включается автоматически при наличии устройства
+        self.use_gpu = False
+        # OpenCL (UMat) без CUDA — только по явному включению: на встроенной графике
+        # пересылка кадра туда и обратно обычно дороже дебайеризации на CPU
+        self.use_opencl = False
+        self._u_dst = None  # Постоянный выходной буфер OpenCL-устройства (пересоздается при смене формы)
+        self._u_shape = None
+        self._cuda_stream = None
+        self._gpu_src = None
+        self._gpu_dst = None
+        self._gpu_host = None  # Page-locked копия сырого кадра для асинхронной загрузки
+        self._pinned = {}  # id(массив) -> массив, зарегистрированный как page-locked
+        self._retired_seen = None  # Поколение слотов провайдера, уже снятое с page-locked
+
+        # Внутренний параллелизм OpenCV (SIMD + пул потоков) для CPU-дебайеризации;
+        # одно ядро оставляем под GUI
+        cv2.setUseOptimized(True)
+        cv2.setNumThreads(max(1, (os.cpu_count() or 1) - 1))
+        # На ARM (Raspberry Pi, Jetson) широкий SIMD-путь OpenCV — NEON, а не AVX2
+        if not (cv2.checkHardwareSupport(cv2.CPU_AVX2) or cv2.checkHardwareSupport(cv2.CPU_NEON)):
+            logger.warning("OpenCV без AVX2/NEON: дебайеризация пойдет по медленному SIMD-пути")
 
     def run(self):
-        """Главный цикл захвата кадров (выполняется в отдельном потоке)."""
+        """Инициализация камеры и запуск захвата (выполняется в отдельном потоке)."""
         try:
             self.system = PySpin.System.GetInstance()
             cam_list = self.system.GetCameras()
@@ -117,9 +365,16 @@ class CameraWorker(QThread):
 
             self.camera = cam_list.GetByIndex(0)
             self.camera.Init()
+            self._cache_nodes()
             
             # Применяем конфигурацию перед стартом потока
             self._apply_initial_settings()
+            self._refresh_ranges()
+            self.use_gpu = self._init_gpu()
+
+            # Конвертер Spinnaker для форматов, которых нет в быстром пути OpenCV
+            self._processor = PySpin.ImageProcessor()
+            self._processor.SetColorProcessing(PySpin.SPINNAKER_COLOR_PROCESSING_ALGORITHM_HQ_LINEAR)
             
             # Считывание эталонных метрик камеры
             target_fps = 0.0
@@ -133,66 +388,270 @@ class CameraWorker(QThread):
                 fps_node = PySpin.CFloatPtr(nodemap.GetNode("AcquisitionResultingFrameRate"))
                 if PySpin.IsAvailable(fps_node):
                     target_fps = fps_node.GetValue()
+
+                # Оценка потока данных: камера сама ограничивает частоту кадров по
+                # DeviceLinkThroughputLimit, поэтому упор в канал виден как падение FPS
+                payload = PySpin.CIntegerPtr(nodemap.GetNode("PayloadSize"))
+                limit = PySpin.CIntegerPtr(nodemap.GetNode("DeviceLinkThroughputLimit"))
+                if PySpin.IsAvailable(payload) and PySpin.IsAvailable(limit) and target_fps > 0:
+                    rate = payload.GetValue() * target_fps
+                    logger.info("Поток данных: %.1f МБ/с при %.1f FPS", rate / 1e6, target_fps)
+                    if rate > 0.95 * limit.GetValue():
+                        logger.warning("Поток упирается в канал (%.1f МБ/с): уменьшите разрешение "
+                                       "или выберите 8-битный формат Mono8/BayerRG8", limit.GetValue() / 1e6)
             except Exception as e:
-                logger.warning(f"Ошибка чтения метрик сенсора: {e}")
+                logger.warning("Ошибка чтения метрик сенсора: %s", e)
 
+            # Счетчики для телеметрии (монотонные часы в наносекундах, без скачков системного времени)
+            self._target_fps = target_fps
+            self._fps_counter = 0
+            # Часы опрашиваются раз в N кадров (~10 раз в секунду), а не на каждом кадре
+            self._fps_check_every = max(1, int(target_fps // 10))
+            self._total_frames = 0
+            self._start_ns = time.perf_counter_ns()
+            self._fps_timer_ns = self._start_ns
+
+            # Кадры доставляет внутренний поток Spinnaker через обработчик событий:
+            # ожидание кадра идет в C++, без опроса GetNextImage из Python
+            self._event_handler = FrameEventHandler(self)
+            self.camera.RegisterEventHandler(self._event_handler)
+
+            self.running = True
             self.camera.BeginAcquisition()
             self.status_changed.emit("Камера запущена")
-            self.running = True
-            
-            # Счетчики для телеметрии
-            fps_counter = 0
-            total_frames = 0
-            start_time = time.time()
-            fps_timer = start_time
-            
-            while self.running:
-                with QMutexLocker(self._lock):
-                    if not self.running: break
-                    try:
-                        # Получение сырого кадра из буфера
-                        image_result = self.camera.GetNextImage(1000)
-                        if image_result.IsIncomplete():
-                            image_result.Release()
-                            continue
-
-                        # Конвертация и обработка (AWB, Видеозапись)
-                        qimage = self._convert_to_qimage(image_result)
-                        if not qimage.isNull():
-                            self.frame_ready.emit(qimage)
-                            fps_counter += 1
-                            total_frames += 1
-                        
-                        image_result.Release()
-                    except Exception as e:
-                        continue
-
-                # Обновление телеметрии каждую секунду
-                current_time = time.time()
-                if current_time - fps_timer >= 1.0:
-                    current_fps = fps_counter / (current_time - fps_timer)
-                    elapsed_total = current_time - start_time
-                    avg_fps = total_frames / elapsed_total if elapsed_total > 0 else 0.0
-                    efficiency = (current_fps / target_fps * 100.0) if target_fps > 0 else 0.0
-                    
-                    self.metrics_updated.emit(current_fps, avg_fps, target_fps, efficiency)
-                    fps_counter = 0
-                    fps_timer = current_time
+
+            # Поток воркера только обслуживает цикл событий Qt до вызова stop()
+            self.exec()
 
         except Exception as e:
-            logger.critical(f"Критический сбой потока камеры: {e}", exc_info=True)
+            logger.critical("Критический сбой потока камеры: %s", e, exc_info=True)
             self.error_occurred.emit(str(e))
         finally:
             self._cleanup()
 
+    def on_image(self, image_result):
+        """
+        Обработка кадра из потока Spinnaker (вызывается FrameEventHandler).
+        Буфер кадра SDK освобождает сам после возврата из обработчика.
+        """
+        if not self._thread_pinned:
+            # Флаг ставится до вызова: при сбое настройка не повторяется на каждом кадре
+            self._thread_pinned = True
+            try: self._pin_capture_thread()
+            except Exception as e:
+                logger.warning("Не удалось настроить поток захвата: %s", e)
+
+        # Без мьютекса на кадр: EndAcquisition() в set_pixel_format сам дожидается
+        # завершения этого обработчика, флаг лишь отбрасывает кадры на время перенастройки
+        if self._reconfiguring or not self.running: return
+        try:
+            if image_result.IsIncomplete(): return
+            # Телеметрия считает каждый полный кадр камеры, независимо от скорости GUI
+            self._fps_counter += 1
+            self._total_frames += 1
+
+            # GUI еще не забрал предыдущий кадр: этот не будет показан, дебайеризацию
+            # пропускаем (при записи видео обрабатывается каждый кадр)
+            if not self._frame_signal_pending or self.is_recording:
+                # Конвертация и обработка (AWB, Видеозапись)
+                if self._process_frame(image_result):
+                    # Не более одного frame_ready в очереди GUI: при отставании интерфейса
+                    # сигналы не копятся, а слот все равно читается самый свежий
+                    if not self._frame_signal_pending:
+                        self._frame_signal_pending = True
+                        self.frame_ready.emit()
+        except Exception as e:
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Ошибка получения кадра: %s", e)
+
+        # Обновление телеметрии не чаще раза в секунду
+        if self._fps_counter % self._fps_check_every: return
+        now_ns = time.perf_counter_ns()
+        if now_ns - self._fps_timer_ns >= FPS_WINDOW_NS:
+            current_fps = self._fps_counter * 1e9 / (now_ns - self._fps_timer_ns)
+            avg_fps = self._total_frames * 1e9 / (now_ns - self._start_ns)
+            target_fps = self._target_fps
+            efficiency = (current_fps / target_fps * 100.0) if target_fps > 0 else 0.0
+
+            self.metrics_updated.emit(current_fps, avg_fps, target_fps, efficiency)
+            self._fps_counter = 0
+            self._fps_timer_ns = now_ns
+
+    def ack_frame(self):
+        """Вызывается GUI-потоком при обработке frame_ready: разрешает следующий сигнал."""
+        self._frame_signal_pending = False
+
+    def _pin_capture_thread(self):
+        """
+        Повышение приоритета и привязка к выделенному ядру текущего потока обработки
+        кадров (поток обратных вызовов Spinnaker, а не QThread воркера).
+        """
+        self._raise_thread_priority()
+        if self.nic_interface:
+            cpu = self._nic_local_cpu(self.nic_interface)
+            if cpu is not None:
+                self.capture_cpu = cpu
+        if self.capture_cpu is None: return
+        try:
+            if hasattr(os, "sched_setaffinity"):
+                # В Linux pid 0 означает вызывающий поток, а не весь процесс
+                os.sched_setaffinity(0, {self.capture_cpu})
+            elif sys.platform == "win32":
+                import ctypes
+                kernel32 = ctypes.windll.kernel32
+                kernel32.SetThreadAffinityMask(kernel32.GetCurrentThread(), 1 << self.capture_cpu)
+        except OSError as e:
+            logger.warning("Не удалось закрепить поток захвата за CPU %d: %s", self.capture_cpu, e)
+
+    @staticmethod
+    def _set_node(nodemap, name, value):
+        """
+        Запись в узел GenICam по имени; тип узла определяется типом значения
+        (str — пункт перечисления, bool, int/float — с ограничением диапазоном и шагом).
+        Возвращает записанное значение или None, если узел недоступен.
+        """
+        try:
+            node = nodemap.GetNode(name)
+            if isinstance(value, str):
+                node = PySpin.CEnumerationPtr(node)
+                if not (PySpin.IsAvailable(node) and PySpin.IsWritable(node)): return None
+                entry = node.GetEntryByName(value)
+                if not PySpin.IsAvailable(entry): return None
+                node.SetIntValue(entry.GetValue())
+                return value
+            if isinstance(value, bool):
+                node = PySpin.CBooleanPtr(node)
+            elif isinstance(value, int):
+                node = PySpin.CIntegerPtr(node)
+            else:
+                node = PySpin.CFloatPtr(node)
+            if not (PySpin.IsAvailable(node) and PySpin.IsWritable(node)): return None
+            if isinstance(value, int) and not isinstance(value, bool):
+                lo, inc = node.GetMin(), max(1, node.GetInc())
+                value = lo + (min(node.GetMax(), max(lo, value)) - lo) // inc * inc
+            elif isinstance(value, float):
+                value = max(node.GetMin(), min(node.GetMax(), value))
+            node.SetValue(value)
+            return node.GetValue()
+        except PySpin.SpinnakerException:
+            return None
+
+    def _negotiate_packet_size(self):
+        """
+        Размер пакета GVSP, который реально проходит по каналу: jumbo-кадры 9000
+        без поддержки сетевой картой означают полную потерю потока.
+        """
+        size = self.packet_size
+        if self.nic_interface:
+            try:
+                with open(f"/sys/class/net/{self.nic_interface}/mtu") as f:
+                    size = min(size, int(f.read()))
+            except (OSError, ValueError):
+                pass
+        try:
+            # Spinnaker проверяет путь тестовыми пакетами (только для GigE-камер)
+            size = min(size, self.camera.DiscoverMaxPacketSize())
+        except (AttributeError, PySpin.SpinnakerException):
+            pass
+        return size
+
+    def _check_socket_buffer(self):
+        """Предупреждение, если ядро Linux ограничивает приемный буфер UDP ниже нужного."""
+        try:
+            with open("/proc/sys/net/core/rmem_max") as f:
+                rmem_max = int(f.read())
+        except (OSError, ValueError):
+            return
+        # Нехватка SO_RCVBUF — основная причина потери пакетов GVSP при всплесках
+        if rmem_max < self.socket_buffer_size:
+            logger.warning("net.core.rmem_max = %d < %d: возможны потери пакетов GigE "
+                           "(sysctl -w net.core.rmem_max=%d)",
+                           rmem_max, self.socket_buffer_size, self.socket_buffer_size)
+
+    @staticmethod
+    def _raise_thread_priority():
+        """Приоритет реального времени для вызывающего потока (без прав — только предупреждение)."""
+        try:
+            if hasattr(os, "sched_setscheduler"):
+                # В Linux pid 0 означает вызывающий поток; SCHED_FIFO требует CAP_SYS_NICE
+                os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(1))
+            elif sys.platform == "win32":
+                import ctypes
+                kernel32 = ctypes.windll.kernel32
+                THREAD_PRIORITY_TIME_CRITICAL = 15
+                kernel32.SetThreadPriority(kernel32.GetCurrentThread(), THREAD_PRIORITY_TIME_CRITICAL)
+        except OSError as e:
+            logger.warning("Не удалось повысить приоритет потока захвата: %s", e)
+
+    @staticmethod
+    def _nic_local_cpu(iface):
+        """Первое ядро (кроме CPU 0), локальное для сетевой карты, или None."""
+        try:
+            with open(f"/sys/class/net/{iface}/device/local_cpulist") as f:
+                spec = f.read().strip()
+        except OSError:
+            return None
+        # Формат списка: "0-7,16-23" (допускаются пробелы и переводы строк)
+        try:
+            for part in spec.replace("\n", ",").split(","):
+                part = part.strip()
+                if not part: continue
+                first, _, last = part.partition("-")
+                for cpu in range(int(first), int(last or first) + 1):
+                    if cpu != 0:
+                        return cpu
+        except ValueError:
+            logger.warning("Не удалось разобрать local_cpulist для %s: %r", iface, spec)
+        return None
+
     def _apply_initial_settings(self):
         """Запись стартовых параметров в регистры камеры."""
         try:
+            # Параметры транспорта одним проходом по таблице (порядок важен: режим
+            # счетчика буферов до его значения). NewestOnly: при отставании GUI
+            # обработчик получает последний кадр, а не очередь устаревших; chunk-данные
+            # не используются, а каждый включенный блок удлиняет кадр на канале
+            packet_size = self._negotiate_packet_size()
+            tl_nodemap = self.camera.GetTLStreamNodeMap()
+            nodemap = self.camera.GetNodeMap()
+            for target, name, value in (
+                (tl_nodemap, "StreamAutoNegotiatePacketSize", "Off"),
+                (tl_nodemap, "StreamPacketSize", packet_size),
+                (nodemap, "GevSCPSPacketSize", packet_size),
+                (nodemap, "ChunkModeActive", False),
+                (tl_nodemap, "StreamBufferHandlingMode", "NewestOnly"),
+                (tl_nodemap, "StreamBufferCountMode", "Manual"),
+                (tl_nodemap, "StreamBufferCountManual", self.buffer_count),
+                # Повторная передача потерянных пакетов: без нее один потерянный пакет
+                # из сотен jumbo-пакетов кадра делает весь кадр неполным
+                (tl_nodemap, "StreamPacketResendEnable", True),
+            ):
+                applied = self._set_node(target, name, value)
+                if applied is not None and name in ("GevSCPSPacketSize", "StreamBufferCountManual"):
+                    logger.info("%s = %s", name, applied)
+            self._check_socket_buffer()
+
+            # Ширина кадра, кратная width_align (с учетом шага узла Width)
             try:
-                nodemap = self.camera.GetTLStreamNodeMap()
-                node = PySpin.CIntegerPtr(nodemap.GetNode("StreamPacketSize"))
-                if PySpin.IsAvailable(node) and PySpin.IsWritable(node):
-                    node.SetValue(min(node.GetMax(), self.packet_size))
+                width = PySpin.CIntegerPtr(self.camera.GetNodeMap().GetNode("Width"))
+                if PySpin.IsAvailable(width) and PySpin.IsWritable(width):
+                    step = max(self.width_align, width.GetInc())
+                    aligned = width.GetValue() // step * step
+                    current = width.GetValue()
+                    if aligned >= width.GetMin() and aligned != current:
+                        width.SetValue(aligned)
+                        logger.info("Ширина кадра обрезана до кратной %d: %d -> %d", step, current, aligned)
+            except: pass
+
+            # Автоматика камеры отключается один раз, дальше сеттеры пишут только значения
+            try:
+                if self._exp_auto_off is not None and PySpin.IsWritable(self._exp_auto_node):
+                    self._exp_auto_node.SetIntValue(self._exp_auto_off)
+                if PySpin.IsWritable(self._gamma_enable_node):
+                    self._gamma_enable_node.SetValue(True)
+                # Принудительно отключаем встроенный AWB камеры
+                if self._wb_auto_off is not None and PySpin.IsWritable(self._wb_auto_node):
+                    self._wb_auto_node.SetIntValue(self._wb_auto_off)
             except: pass
 
             self.set_pixel_format(self.pixel_format_str, force_restart=False)
@@ -202,75 +661,92 @@ class CameraWorker(QThread):
             
             if not self.wb_auto:
                 self.set_wb_red(self.wb_red)
-                
-            # Принудительно отключаем встроенный AWB камеры
-            try:
-                nodemap = self.camera.GetNodeMap()
-                wb_auto = PySpin.CEnumerationPtr(nodemap.GetNode("BalanceWhiteAuto"))
-                if PySpin.IsAvailable(wb_auto) and PySpin.IsWritable(wb_auto):
-                    wb_auto.SetIntValue(wb_auto.GetEntryByName("Off").GetValue())
-            except: pass
             
         except Exception as e:
-            logger.error(f"Ошибка настройки параметров: {e}")
+            logger.error("Ошибка настройки параметров: %s", e)
 
-    def _convert_to_qimage(self, image_result):
+    def _process_frame(self, image_result):
         """
         Математическое ядро потока.
-        Выполняет конвертацию RAW -> RGB, гибридный баланс белого и запись видео.
+        Выполняет конвертацию RAW -> RGB прямо в слот провайдера, гибридный баланс белого
+        и запись видео. Возвращает True, если кадр опубликован для отображения.
         """
         try:
-            image_data = image_result.GetNDArray()
-            current_format = image_result.GetPixelFormat() 
-            rgb = None
-            
-            # Дебайеризация и корректировка каналов
-            if current_format == PySpin.PixelFormat_Mono8:
-                rgb = cv2.cvtColor(image_data, cv2.COLOR_GRAY2RGB)
-            elif current_format == PySpin.PixelFormat_BayerRG8:
+            current_format = image_result.GetPixelFormat()
+            if current_format not in self.NATIVE_FORMATS and self._processor is not None:
+                # Прочие форматы (другие шаблоны Bayer, упакованные 10/12 бит)
+                # конвертирует в RGB8 сам Spinnaker
+                image_result = self._processor.Convert(image_result, PySpin.PixelFormat_RGB8)
+                current_format = PySpin.PixelFormat_RGB8
+            image_data = self._frame_view(image_result)
+
+            if image_data.dtype == np.uint16:
+                # 16-битные форматы приводятся к 8 битам, дальше кадр идет обычным
+                # путем Mono8 / BayerRG8
+                if self._buf8 is None or self._buf8.shape != image_data.shape:
+                    self._buf8 = np.empty(image_data.shape, np.uint8)
+                lut = self._lut16
+                if lut is None:
+                    # Гамма 1.0: старший байт одним векторизованным сдвигом NumPy
+                    np.right_shift(image_data, 8, out=self._buf8, casting='unsafe')
+                else:
+                    self._apply_lut16(lut, image_data, self._buf8)
+                image_data = self._buf8
+
+            # Формат QImage подбирается под фактическую раскладку байт кадра одним
+            # поиском в таблице, поэтому cvtColor нужен только для дебайеризации.
+            qformat = self.NATIVE_FORMATS.get(
+                current_format,
+                QImage.Format_Grayscale8 if image_data.ndim == 2 else QImage.Format_RGB888)
+            if qformat is None:
                 # ВНИМАНИЕ: Используется BayerRG2BGR для исправления Red/Blue swap
-                rgb = cv2.cvtColor(image_data, cv2.COLOR_BayerRG2BGR)
-            elif current_format == PySpin.PixelFormat_RGB8:
-                rgb = image_data
+                # (шаблоны Bayer в OpenCV сдвинуты, на выходе порядок байт RGB)
+                code, ch = self.DEMOSAIC_CODES.get(self.demosaic_method, self.DEMOSAIC_CODES["bilinear"])
+                frame = self.provider.acquire_frame_buffer(image_data.shape[:2] + (ch,))
+                self._demosaic(image_data, frame, code)
+                # RGBA с альфой 255 — родной формат текстуры scene graph: Qt загружает
+                # кадр без собственного прохода конвертации RGB888 -> RGBA
+                qformat = QImage.Format_RGBA8888_Premultiplied if ch == 4 else QImage.Format_RGB888
             else:
-                rgb = cv2.cvtColor(image_data, cv2.COLOR_GRAY2RGB) if len(image_data.shape) == 2 else image_data
+                # Единственная копия: буфер PySpin будет освобожден после обработки
+                frame = self.provider.acquire_frame_buffer(image_data.shape)
+                np.copyto(frame, image_data)
 
-            # ГИБРИДНЫЙ АВТОБАЛАНС БЕЛОГО
-            if hasattr(self, 'wb_auto') and self.wb_auto:
-                current_time = time.time()
-                if not hasattr(self, '_last_awb_time'):
-                    self._last_awb_time = 0
+            # ГИБРИДНЫЙ АВТОБАЛАНС БЕЛОГО (для монохромного кадра не имеет смысла)
+            if self.wb_auto and frame.ndim == 3:
+                # Индексы красного и синего каналов зависят от порядка байт
+                r_idx, b_idx = (2, 0) if qformat == QImage.Format_BGR888 else (0, 2)
+                current_ns = time.perf_counter_ns()
                     
                 # Анализируем кадр каждые 1.5 секунды для экономии CPU
-                if current_time - self._last_awb_time > 1.5:
-                    self._last_awb_time = current_time
+                if current_ns - self._last_awb_ns > AWB_INTERVAL_NS:
+                    self._last_awb_ns = current_ns
                     
-                    avg_r = float(np.mean(rgb[:, :, 0]))
-                    avg_g = float(np.mean(rgb[:, :, 1]))
-                    avg_b = float(np.mean(rgb[:, :, 2]))
+                    avg_r = float(np.mean(frame[:, :, r_idx]))
+                    avg_g = float(np.mean(frame[:, :, 1]))
+                    avg_b = float(np.mean(frame[:, :, b_idx]))
                     
                     if avg_r > 5 and avg_b > 5:
                         try:
-                            nodemap = self.camera.GetNodeMap()
-                            ratio_node = PySpin.CFloatPtr(nodemap.GetNode("BalanceRatio"))
-                            selector = PySpin.CEnumerationPtr(nodemap.GetNode("BalanceRatioSelector"))
+                            ratio_node = self._wb_ratio_node
+                            selector = self._wb_selector_node
                             
                             # Расчет коэффициентов с учетом 50% демпфирования (плавности)
-                            selector.SetIntValue(selector.GetEntryByName("Red").GetValue())
+                            selector.SetIntValue(self._wb_red_entry)
                             current_red = ratio_node.GetValue()
                             target_red = current_red * (avg_g / avg_r)
                             new_red = current_red * 0.5 + target_red * 0.5
                             
-                            selector.SetIntValue(selector.GetEntryByName("Blue").GetValue())
+                            selector.SetIntValue(self._wb_blue_entry)
                             current_blue = ratio_node.GetValue()
                             target_blue = current_blue * (avg_g / avg_b)
                             new_blue = current_blue * 0.5 + target_blue * 0.5
                             
                             # Применение параметров аппаратно
-                            selector.SetIntValue(selector.GetEntryByName("Red").GetValue())
+                            selector.SetIntValue(self._wb_red_entry)
                             ratio_node.SetValue(min(ratio_node.GetMax(), max(ratio_node.GetMin(), new_red)))
                             
-                            selector.SetIntValue(selector.GetEntryByName("Blue").GetValue())
+                            selector.SetIntValue(self._wb_blue_entry)
                             ratio_node.SetValue(min(ratio_node.GetMax(), max(ratio_node.GetMin(), new_blue)))
                             
                             # Уведомляем UI об изменении
@@ -282,26 +758,138 @@ class CameraWorker(QThread):
             with QMutexLocker(self._video_lock):
                 if self.is_recording:
                     if self.video_writer is None:
-                        h, w = rgb.shape[:2]
+                        h, w = frame.shape[:2]
                         # Маршрутизация кодека в зависимости от контейнера
                         if hasattr(self, 'record_fmt') and self.record_fmt == 'avi':
                             fourcc = cv2.VideoWriter_fourcc(*'XVID')
                         else:
                             fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-                            
-                        self.video_writer = cv2.VideoWriter(self.record_path, fourcc, self.record_fps, (w, h))
-                        logger.info(f"Video stream opened: {w}x{h} @ {self.record_fps} FPS, Codec: {self.record_fmt}")
-                    
+
+                        self.video_writer = cv2.VideoWriter(self.record_path, fourcc, self.record_fps, (w, h),
+                                                            frame.ndim == 3)
+                        logger.info("Video stream opened: %dx%d @ %.1f FPS, Codec: %s", w, h, self.record_fps, self.record_fmt)
+
                     if self.video_writer and self.video_writer.isOpened():
-                        self.video_writer.write(rgb)
+                        # VideoWriter ожидает порядок BGR
+                        if qformat != QImage.Format_BGR888 and frame.ndim == 3:
+                            if self._record_buf is None or self._record_buf.shape[:2] != frame.shape[:2]:
+                                self._record_buf = np.empty(frame.shape[:2] + (3,), np.uint8)
+                            code = cv2.COLOR_RGBA2BGR if frame.shape[2] == 4 else cv2.COLOR_RGB2BGR
+                            cv2.cvtColor(frame, code, dst=self._record_buf)
+                            self.video_writer.write(self._record_buf)
+                        else:
+                            self.video_writer.write(frame)
 
-            # Сборка QImage для UI
-            h, w, ch = rgb.shape
-            bytes_per_line = ch * w
-            img = QImage(rgb.data, w, h, bytes_per_line, QImage.Format_RGB888)
-            return img.copy()
+            # Публикация слота для UI
+            self.provider.publish(qformat)
+            return True
         except Exception as e:
-            return QImage()
+            # Горячий путь: строка сообщения собирается, только если DEBUG включен
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Ошибка обработки кадра: %s", e)
+            return False
+
+    @staticmethod
+    def _frame_view(image_result):
+        """
+        Представление буфера кадра PySpin в виде numpy-массива без копирования.
+        Действительно только до image_result.Release(), поэтому вся обработка
+        кадра должна завершиться до освобождения буфера.
+        """
+        h, w = image_result.GetHeight(), image_result.GetWidth()
+        ch = image_result.GetNumChannels()
+        stride = image_result.GetStride()
+        dtype = np.uint16 if image_result.GetBitsPerPixel() == 16 * ch else np.uint8
+        rows = np.frombuffer(image_result.GetData(), dtype=np.uint8)[:h * stride].reshape(h, stride)
+        rows = rows.view(dtype)[:, :w * ch]
+        return rows if ch == 1 else rows.reshape(h, w, ch)
+
+    def _init_gpu(self):
+        """Проверка наличия CUDA-устройства и подготовка буферов GPU для дебайеризации."""
+        try:
+            if cv2.cuda.getCudaEnabledDeviceCount() > 0:
+                self._cuda_stream = cv2.cuda.Stream()
+                self._gpu_src = cv2.cuda_GpuMat()
+                self._gpu_dst = cv2.cuda_GpuMat()
+                logger.info("Дебайеризация выполняется на GPU (OpenCV CUDA, MHT)")
+                return True
+        except (AttributeError, cv2.error):
+            # Сборка OpenCV без модуля CUDA
+            pass
+        if self.use_opencl:
+            self.use_opencl = cv2.ocl.haveOpenCL()
+            cv2.ocl.setUseOpenCL(self.use_opencl)
+            if self.use_opencl:
+                logger.info("Дебайеризация выполняется через OpenCL (%s)", cv2.ocl.Device.getDefault().name())
+        return False
+
+    def _demosaic(self, image_data, dst, code):
+        """Дебайеризация BayerRG8 в заранее выделенный буфер (GPU с откатом на CPU)."""
+        # EA/VNG на GPU нет: при явном выборе этих методов кадр идет на OpenCL/CPU
+        if self.use_gpu and code == self.DEMOSAIC_CODES["bilinear"][0]:
+            try:
+                # Оба конца передачи в page-locked памяти: upload/download идут
+                # прямым DMA без промежуточного копирования в драйвере
+                if self._gpu_host is None or self._gpu_host.shape != image_data.shape:
+                    if self._gpu_host is not None:
+                        self._unpin_host(self._gpu_host)
+                    self._gpu_host = np.empty(image_data.shape, np.uint8)
+                    self._pin_host(self._gpu_host)
+                # При росте кадра провайдер заменяет память слотов: старое поколение
+                # снимается с регистрации (сама память живет, пока на нее ссылается GUI)
+                retired = self.provider._retired
+                if retired is not None and retired is not self._retired_seen:
+                    for arr in retired[0]:
+                        self._unpin_host(arr)
+                    self._retired_seen = retired
+                self._pin_host(dst)
+                np.copyto(self._gpu_host, image_data)
+                self._gpu_src.upload(self._gpu_host, self._cuda_stream)
+                # На GPU — Malvar-He-Cutler: качество выше билинейной, время на CPU не тратится.
+                # Ядро CUDA называет шаблон буквально (RG — красный в (0,0), выход BGR), а
+                # cvtColor на CPU — со сдвигом; код BG дает тот же порядок RGB, что и CPU-путь
+                cv2.cuda.demosaicing(self._gpu_src, cv2.cuda.COLOR_BayerBG2BGR_MHT, self._gpu_dst,
+                                     dst.shape[2], stream=self._cuda_stream)
+                self._gpu_dst.download(self._cuda_stream, dst)
+                self._cuda_stream.waitForCompletion()
+                return
+            except cv2.error as e:
+                logger.warning("Сбой GPU-дебайеризации, переход на CPU: %s", e)
+                self.use_gpu = False
+        if self.use_opencl:
+            try:
+                if self._u_shape != dst.shape:
+                    h, w, ch = dst.shape
+                    self._u_dst = cv2.UMat(h, w, cv2.CV_8UC(ch))
+                    self._u_shape = dst.shape
+                # Выход ядра cvtColor — постоянный UMat. Привязки Python не умеют ни
+                # загружать в существующий UMat без временного, ни выгружать в готовый
+                # массив: на кадр остаются временный UMat источника, новый массив из get()
+                # и его копия в слот
+                cv2.cvtColor(image_data, code, dst=self._u_dst)
+                np.copyto(dst, self._u_dst.get())
+                return
+            except cv2.error as e:
+                logger.warning("Сбой OpenCL-дебайеризации, переход на CPU: %s", e)
+                self.use_opencl = False
+        cv2.cvtColor(image_data, code, dst=dst)
+
+    def _pin_host(self, arr):
+        """Однократная регистрация памяти массива (по корневому буферу) как page-locked."""
+        while isinstance(arr.base, np.ndarray):
+            arr = arr.base
+        if id(arr) not in self._pinned:
+            cv2.cuda.registerPageLocked(arr)
+            # Ссылка держит память живой до unregisterPageLocked в _cleanup()
+            self._pinned[id(arr)] = arr
+
+    def _unpin_host(self, arr):
+        """Снятие page-locked регистрации с массива, ставшего ненужным."""
+        while isinstance(arr.base, np.ndarray):
+            arr = arr.base
+        if self._pinned.pop(id(arr), None) is not None:
+            try: cv2.cuda.unregisterPageLocked(arr)
+            except cv2.error: pass
 
     # МЕТОДЫ УПРАВЛЕНИЯ ПАРАМЕТРАМИ 
     
@@ -323,88 +911,183 @@ class CameraWorker(QThread):
                 self.video_writer = None
                 logger.info("Видеопоток закрыт и сохранен.")
 
+    def _cache_nodes(self):
+        """
+        Однократный поиск узлов GenICam после Init().
+        Сеттеры вызываются на каждое движение ползунка, поэтому строковый поиск
+        по карте узлов и создание оберток CFloatPtr/CEnumerationPtr вынесены сюда.
+        """
+        nodemap = self.camera.GetNodeMap()
+        self._pf_node = PySpin.CEnumerationPtr(nodemap.GetNode("PixelFormat"))
+        self._gain_node = PySpin.CFloatPtr(nodemap.GetNode("Gain"))
+        self._exp_node = PySpin.CFloatPtr(nodemap.GetNode("ExposureTime"))
+        self._exp_auto_node = PySpin.CEnumerationPtr(nodemap.GetNode("ExposureAuto"))
+        self._gamma_node = PySpin.CFloatPtr(nodemap.GetNode("Gamma"))
+        self._gamma_enable_node = PySpin.CBooleanPtr(nodemap.GetNode("GammaEnable"))
+        self._wb_auto_node = PySpin.CEnumerationPtr(nodemap.GetNode("BalanceWhiteAuto"))
+        self._wb_selector_node = PySpin.CEnumerationPtr(nodemap.GetNode("BalanceRatioSelector"))
+        self._wb_ratio_node = PySpin.CFloatPtr(nodemap.GetNode("BalanceRatio"))
+
+        # Целочисленные значения используемых пунктов перечислений
+        self._exp_auto_off = self._entry_value(self._exp_auto_node, "Off")
+        self._wb_auto_off = self._entry_value(self._wb_auto_node, "Off")
+        self._wb_red_entry = self._entry_value(self._wb_selector_node, "Red")
+        self._wb_blue_entry = self._entry_value(self._wb_selector_node, "Blue")
+
+        self._refresh_ranges()
+        self._nodes_cached = True
+
+    def _refresh_ranges(self):
+        """
+        Диапазоны для ограничения значений без GetMin()/GetMax() на каждый вызов.
+        Перечитываются после изменений, от которых они зависят (ширина, формат пикселя).
+        """
+        self._exp_range = self._node_range(self._exp_node)
+        self._gain_range = self._node_range(self._gain_node)
+        self._gamma_range = self._node_range(self._gamma_node)
+
+    def _set_clamped(self, node, range_attr, value):
+        """Запись с ограничением кэшированным диапазоном; при отказе диапазон перечитывается один раз."""
+        for _ in range(2):
+            lo, hi = getattr(self, range_attr)
+            try:
+                node.SetValue(lo if value < lo else hi if value > hi else value)
+                return
+            except PySpin.SpinnakerException:
+                setattr(self, range_attr, self._node_range(node))
+
+    @staticmethod
+    def _node_range(node):
+        """Пара (min, max) числового узла или (-inf, inf), если узел недоступен."""
+        try:
+            if PySpin.IsAvailable(node) and PySpin.IsReadable(node):
+                return node.GetMin(), node.GetMax()
+        except PySpin.SpinnakerException:
+            pass
+        return float("-inf"), float("inf")
+
+    @staticmethod
+    def _entry_value(enum_node, name):
+        """Целочисленное значение пункта перечисления или None, если узел недоступен."""
+        try:
+            if PySpin.IsAvailable(enum_node):
+                entry = enum_node.GetEntryByName(name)
+                if PySpin.IsAvailable(entry):
+                    return entry.GetValue()
+        except PySpin.SpinnakerException:
+            pass
+        return None
+
     def set_pixel_format(self, format_name, force_restart=True):
-        if not self.camera: return
+        if not self._nodes_cached: return
         with QMutexLocker(self._lock):
+            self._reconfiguring = True
             try:
                 was_streaming = self.camera.IsStreaming()
                 if was_streaming and force_restart:
                     self.camera.EndAcquisition()
                 
-                nodemap = self.camera.GetNodeMap()
-                node_pf = PySpin.CEnumerationPtr(nodemap.GetNode("PixelFormat"))
-                if PySpin.IsAvailable(node_pf) and PySpin.IsWritable(node_pf):
-                    entry = node_pf.GetEntryByName(format_name)
-                    if PySpin.IsAvailable(entry):
-                        node_pf.SetIntValue(entry.GetValue())
-                        self.pixel_format_str = format_name
+                value = self._entry_value(self._pf_node, format_name)
+                if value is not None and PySpin.IsWritable(self._pf_node):
+                    self._pf_node.SetIntValue(value)
+                    self.pixel_format_str = format_name
+                    self._refresh_ranges()
                 
                 if was_streaming and force_restart:
                     self.camera.BeginAcquisition()
             except: pass
+            finally:
+                self._reconfiguring = False
     
+    @staticmethod
+    def _build_lut16(gamma):
+        """Таблица 65536 -> uint8 с гамма-коррекцией для отображения 16-битных кадров."""
+        x = np.linspace(0.0, 1.0, 65536)
+        return np.clip(np.rint(255.0 * x ** gamma), 0, 255).astype(np.uint8)
+
+    LUT_BAND_ROWS = 64
+
+    def _apply_lut16(self, lut, src, dst):
+        """
+        Выборка uint16 -> uint8 по таблице полосами строк. np.take приводит индексы
+        к intp, и для кадра целиком это временный массив в 4-8 раз больше кадра;
+        здесь полоса копируется в заранее выделенный буфер intp (около 1 МБ, остается в кэше).
+        """
+        src = src.reshape(src.shape[0], -1)
+        dst = dst.reshape(dst.shape[0], -1)
+        rows = min(self.LUT_BAND_ROWS, src.shape[0])
+        if self._lut_idx is None or self._lut_idx.shape != (rows, src.shape[1]):
+            self._lut_idx = np.empty((rows, src.shape[1]), np.intp)
+        idx = self._lut_idx
+        for y in range(0, src.shape[0], rows):
+            n = min(rows, src.shape[0] - y)
+            np.copyto(idx[:n], src[y:y + n])
+            # mode="clip": индексы всегда в пределах таблицы, а при mode="raise"
+            # NumPy пишет через временный буфер вместо прямой записи в out
+            np.take(lut, idx[:n], out=dst[y:y + n], mode="clip")
+
     def set_gamma(self, value):
-        if self.camera:
+        # Гамма камеры действует только на 8-битный выход, для 16-битных
+        # форматов она применяется в таблице понижения разрядности
+        gamma = max(0.1, value)
+        self._lut16 = None if gamma == 1.0 else self._build_lut16(gamma)
+        if self._nodes_cached:
             try:
-                nodemap = self.camera.GetNodeMap()
-                gamma_enable = PySpin.CBooleanPtr(nodemap.GetNode("GammaEnable"))
-                if PySpin.IsAvailable(gamma_enable) and PySpin.IsWritable(gamma_enable):
-                    gamma_enable.SetValue(True)
-                
-                node = PySpin.CFloatPtr(nodemap.GetNode("Gamma"))
-                if PySpin.IsAvailable(node) and PySpin.IsWritable(node):
-                    node.SetValue(max(node.GetMin(), min(value, node.GetMax())))
+                if PySpin.IsWritable(self._gamma_node):
+                    self._set_clamped(self._gamma_node, "_gamma_range", value)
             except: pass
 
     def set_gain(self, value):
-        if self.camera:
+        if self._nodes_cached:
             try:
-                node = PySpin.CFloatPtr(self.camera.GetNodeMap().GetNode("Gain"))
-                if PySpin.IsAvailable(node) and PySpin.IsWritable(node):
-                    node.SetValue(value)
+                if PySpin.IsWritable(self._gain_node):
+                    self._set_clamped(self._gain_node, "_gain_range", value)
             except: pass
 
     def set_exposure(self, value):
-        if self.camera:
+        if self._nodes_cached:
             try:
-                nodemap = self.camera.GetNodeMap()
-                exp_auto = PySpin.CEnumerationPtr(nodemap.GetNode("ExposureAuto"))
-                if PySpin.IsAvailable(exp_auto) and PySpin.IsWritable(exp_auto):
-                    exp_auto.SetIntValue(exp_auto.GetEntryByName("Off").GetValue())
-                
-                node = PySpin.CFloatPtr(nodemap.GetNode("ExposureTime"))
-                if PySpin.IsAvailable(node) and PySpin.IsWritable(node):
-                    node.SetValue(max(node.GetMin(), min(value, node.GetMax())))
+                if PySpin.IsWritable(self._exp_node):
+                    self._set_clamped(self._exp_node, "_exp_range", value)
             except: pass
 
     def set_wb_red(self, value):
-        if self.camera and not self.wb_auto:
+        if self._nodes_cached and not self.wb_auto:
             try:
-                nodemap = self.camera.GetNodeMap()
-                selector = PySpin.CEnumerationPtr(nodemap.GetNode("BalanceRatioSelector"))
-                if PySpin.IsAvailable(selector) and PySpin.IsWritable(selector):
-                    selector.SetIntValue(selector.GetEntryByName("Red").GetValue())
-                
-                ratio = PySpin.CFloatPtr(nodemap.GetNode("BalanceRatio"))
-                if PySpin.IsAvailable(ratio) and PySpin.IsWritable(ratio):
-                    ratio.SetValue(value)
+                if PySpin.IsWritable(self._wb_selector_node):
+                    self._wb_selector_node.SetIntValue(self._wb_red_entry)
+                if PySpin.IsWritable(self._wb_ratio_node):
+                    self._wb_ratio_node.SetValue(value)
             except: pass
 
     def _cleanup(self):
         """Освобождение аппаратных ресурсов при остановке потока."""
         self.stop_recording()
+        # Кэшированные узлы держат ссылки на карту узлов камеры и должны уйти до DeInit()
+        self._nodes_cached = False
+        self._pf_node = self._gain_node = self._exp_node = self._exp_auto_node = None
+        self._gamma_node = self._gamma_enable_node = None
+        self._wb_auto_node = self._wb_selector_node = self._wb_ratio_node = None
         if self.camera:
             try:
                 if self.camera.IsStreaming():
                     self.camera.EndAcquisition()
+                if self._event_handler is not None:
+                    self.camera.UnregisterEventHandler(self._event_handler)
+                    self._event_handler = None
                 self.camera.DeInit()
             except: pass
             del self.camera
+        for arr in self._pinned.values():
+            try: cv2.cuda.unregisterPageLocked(arr)
+            except cv2.error: pass
+        self._pinned.clear()
         if self.system:
             self.system.ReleaseInstance()
     
     def stop(self):
         self.running = False
+        self.quit()
         self.wait()
 
 
@@ -416,7 +1099,6 @@ class CameraController(QObject):
     # СИГНАЛЫ ДЛЯ ОБНОВЛЕНИЯ UI 
     frameChanged = Signal()
     statusChanged = Signal()
-    imagePathChanged = Signal()
     currentFpsChanged = Signal()
     averageFpsChanged = Signal()
     targetFpsChanged = Signal()
@@ -429,12 +1111,13 @@ class CameraController(QObject):
     pixelFormatChanged = Signal()
     gammaChanged = Signal()
     isRecordingChanged = Signal() 
+    # Статус из фонового потока пула: доставляется в GUI-поток через очередь событий
+    _asyncStatus = Signal(str)
 
     def __init__(self):
         super().__init__()
         # Внутреннее состояние системы
         self._status = "Готов"
-        self._image_path = ""
         self._currentFps = 0.0
         self._averageFps = 0.0
         self._targetFps = 0.0
@@ -465,12 +1148,25 @@ class CameraController(QObject):
         self.worker = None
         self.provider = None
 
+        # Отложенная запись параметров в камеру: серия изменений ползунка
+        # в пределах 50 мс превращается в одну транзакцию GenICam
+        self._pending = {}
+        self._apply_timer = QTimer(self)
+        self._apply_timer.setSingleShot(True)
+        self._apply_timer.setInterval(50)
+        self._apply_timer.timeout.connect(self._flush_pending)
+
+        # Последний прочитанный/записанный пресет: (mtime_ns файла, словарь)
+        self._preset_cache = None
+        self._asyncStatus.connect(self._update_status)
+
     def set_image_provider(self, provider):
         self.provider = provider
 
     # ПРИВЯЗКИ (PROPERTIES) ДЛЯ QML 
-    @Property(str, notify=imagePathChanged)
-    def imagePath(self): return self._image_path
+    # Запасной путь для QML Image: постоянный URL, обновление кадра идет через frameChanged
+    @Property(str, constant=True)
+    def imagePath(self): return "image://live/frame"
 
     @Property(bool, notify=isRecordingChanged)
     def isRecording(self): return self._is_recording
@@ -493,7 +1189,8 @@ class CameraController(QObject):
     def start_camera(self):
         """Запуск рабочего потока камеры."""
         if self.worker and self.worker.isRunning(): return
-        self.worker = CameraWorker()
+        if not self.provider: return
+        self.worker = CameraWorker(self.provider)
         
         # Передача текущих настроек в воркер
         self.worker.exposure_time = self._exposure_value
@@ -556,24 +1253,71 @@ class CameraController(QObject):
             path = file_url.replace("file:///", "").replace("file://", "")
 
         if self.provider:
-            # Безопасное копирование данных (Zero-Copy защита)
-            with QMutexLocker(self.provider.mutex):
-                img = self.provider._current_image.copy()
-            
+            # Копия последнего опубликованного кадра (слоты провайдера переиспользуются)
+            img = self.provider.snapshot()
+
             if not img.isNull():
-                success = img.save(path, fmt.upper(), q)
-                if success:
-                    self._update_status("Снимок сохранен")
+                def save():
+                    success = (fmt.upper() == "JPEG" and self._save_jpeg_fast(img, path, q)) \
+                        or img.save(path, fmt.upper(), q)
+                    self._asyncStatus.emit("Снимок сохранен" if success else "Ошибка сохранения")
+                # Сжатие полного кадра в JPEG/PNG занимает десятки миллисекунд:
+                # кодирование идет в пуле потоков, GUI и отрисовка не ждут
+                QThreadPool.globalInstance().start(save)
+
+    @staticmethod
+    def _qimage_array(img):
+        """Представление пикселей QImage как массива NumPy (h, w[, ch]) без учета выравнивания строк."""
+        h, w, ch = img.height(), img.width(), img.depth() // 8
+        rows = np.frombuffer(img.constBits(), np.uint8, img.sizeInBytes()).reshape(h, img.bytesPerLine())
+        return rows[:, :w * ch].reshape((h, w, ch) if ch > 1 else (h, w))
+
+    # Преобразование кадра в BGR для cv2.imencode (None — кадр уже в нужном порядке)
+    _CV_JPEG_CODES = {
+        QImage.Format_Grayscale8: None,
+        QImage.Format_BGR888: None,
+        QImage.Format_RGB888: cv2.COLOR_RGB2BGR,
+        QImage.Format_RGBA8888_Premultiplied: cv2.COLOR_RGBA2BGR,
+    }
+
+    def _save_jpeg_fast(self, img, path, quality):
+        """
+        JPEG через SIMD-кодеры: libjpeg-turbo (PyTurboJPEG), иначе cv2.imencode.
+        False — формат кадра не поддержан или кодирование не удалось.
+        """
+        fmt = img.format()
+        if fmt not in self._CV_JPEG_CODES: return False
+        try:
+            arr = self._qimage_array(img)
+            if _turbo is not None:
+                pixel_format = {
+                    QImage.Format_Grayscale8: TJPF_GRAY,
+                    QImage.Format_RGB888: TJPF_RGB,
+                    QImage.Format_BGR888: TJPF_BGR,
+                    QImage.Format_RGBA8888_Premultiplied: TJPF_RGBA,
+                }[fmt]
+                arr = np.ascontiguousarray(arr)
+                if pixel_format == TJPF_GRAY:
+                    data = _turbo.encode(arr, quality=quality, pixel_format=pixel_format, jpeg_subsample=TJSAMP_GRAY)
                 else:
-                    self._update_status("Ошибка сохранения")
+                    data = _turbo.encode(arr, quality=quality, pixel_format=pixel_format)
+            else:
+                code = self._CV_JPEG_CODES[fmt]
+                if code is not None:
+                    arr = cv2.cvtColor(arr, code)
+                ok, data = cv2.imencode(".jpg", arr, [cv2.IMWRITE_JPEG_QUALITY, quality])
+                if not ok: return False
+            with open(path, 'wb') as f: f.write(data)
+            return True
+        except Exception:
+            return False
 
     # ОБРАБОТЧИКИ СИГНАЛОВ (CALLBACKS) 
-    def _on_frame_ready(self, qimage):
-        if self.provider:
-            self.provider.update_image(qimage)
-            # Обновление пути заставляет QML перерисовать Image
-            self._image_path = f"image://live/frame_{time.time()}"
-            self.imagePathChanged.emit()
+    def _on_frame_ready(self):
+        # Подтверждение до перерисовки: кадр, пришедший во время нее, пошлет новый сигнал
+        if self.worker: self.worker.ack_frame()
+        # Без формирования URL на кадр: LiveView перерисовывается по frameChanged
+        self.frameChanged.emit()
 
     def _update_status(self, msg):
         self._status = msg
@@ -597,6 +1341,19 @@ class CameraController(QObject):
         self._wb_red_value = val
         self.wbRedChanged.emit()
 
+    def _queue_apply(self, name, val):
+        """Запоминает последнее значение параметра и перезапускает таймер отложенной записи."""
+        self._pending[name] = val
+        self._apply_timer.start()
+
+    def _flush_pending(self):
+        """Передает в воркер только итоговые значения параметров после серии изменений."""
+        pending, self._pending = self._pending, {}
+        if not self.worker: return
+        for name, val in pending.items():
+            if name == "wb_red" and self._wb_auto: continue
+            getattr(self.worker, f"set_{name}")(val)
+
     # СЕТТЕРЫ И ГЕТТЕРЫ ДЛЯ ПОЛЗУНКОВ ИЗ QML 
     @Property(float, notify=gainChanged)
     def gainValue(self): return self._gain_value
@@ -604,7 +1361,7 @@ class CameraController(QObject):
     def gainValue(self, val):
         if self._gain_value != val:
             self._gain_value = val
-            if self.worker: self.worker.set_gain(val)
+            self._queue_apply("gain", val)
             self.gainChanged.emit()
 
     @Property(float, notify=wbRedChanged)
@@ -613,8 +1370,7 @@ class CameraController(QObject):
     def wbRedValue(self, val):
         if self._wb_red_value != val:
             self._wb_red_value = val
-            if self.worker and not self._wb_auto: 
-                self.worker.set_wb_red(val)
+            self._queue_apply("wb_red", val)
             self.wbRedChanged.emit()
     
     @Property(float, notify=gammaChanged)
@@ -623,7 +1379,7 @@ class CameraController(QObject):
     def gammaValue(self, val):
         if self._gamma_value != val:
             self._gamma_value = val
-            if self.worker: self.worker.set_gamma(val)
+            self._queue_apply("gamma", val)
             self.gammaChanged.emit()
 
     @Property(float, notify=exposureChanged)
@@ -632,7 +1388,7 @@ class CameraController(QObject):
     def exposureValue(self, val):
         if self._exposure_value != val:
             self._exposure_value = val
-            if self.worker: self.worker.set_exposure(val)
+            self._queue_apply("exposure", val)
             self.exposureChanged.emit()
 
     @Property(bool, notify=wbAutoChanged)
@@ -676,17 +1432,30 @@ class CameraController(QObject):
             "wb_red": self._wb_red_value, "pixel_format_idx": self._pixel_format_index,
             "wb_auto": self._wb_auto, "gamma": self._gamma_value
         }
-        try:
-            with open(self.CONFIG_FILE, 'w') as f: json.dump(config, f, indent=4)
-            self._update_status("Пресет сохранен")
-        except: pass
+        path = self.CONFIG_FILE
+
+        def write():
+            try:
+                self._write_preset(path, config)
+                self._preset_cache = (os.stat(path).st_mtime_ns, config)
+                self._asyncStatus.emit("Пресет сохранен")
+            except: pass
+        # Запись на диск в пуле потоков: медленный диск не блокирует GUI
+        QThreadPool.globalInstance().start(write)
 
     @Slot()
     def load_preset(self):
         """Загрузка состояния ползунков из JSON."""
-        if not os.path.exists(self.CONFIG_FILE): return
+        try: mtime = os.stat(self.CONFIG_FILE).st_mtime_ns
+        except OSError: return
         try:
-            with open(self.CONFIG_FILE, 'r') as f: config = json.load(f)
+            # Файл не менялся с последнего чтения/записи: повторный разбор не нужен
+            cache = self._preset_cache
+            if cache is not None and cache[0] == mtime:
+                config = dict(cache[1])
+            else:
+                config = self._read_preset(self.CONFIG_FILE)
+                self._preset_cache = (mtime, dict(config))
             self.exposureValue = config.get("exposure", self._exposure_value)
             self.gainValue = config.get("gain", self._gain_value)
             self.wbRedValue = config.get("wb_red", self._wb_red_value)
@@ -694,4 +1463,24 @@ class CameraController(QObject):
             self.wbAuto = config.get("wb_auto", True)
             self.gammaValue = config.get("gamma", self._gamma_value)
             self._update_status("Пресет загружен")
-        except: pass
\ No newline at end of file
+        except: pass
+
+    @staticmethod
+    def _write_preset(path, config):
+        # Запись во временный файл и атомарная подмена: сбой посреди записи
+        # не оставляет наполовину записанный пресет
+        tmp = path + ".tmp"
+        if orjson is not None:
+            with open(tmp, 'wb') as f: f.write(orjson.dumps(config, option=orjson.OPT_INDENT_2))
+        else:
+            # Тот же вид, что у orjson (отступ 2, UTF-8 без экранирования): файл
+            # пресета не зависит от того, установлен ли orjson
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(config, f, indent=2, ensure_ascii=False)
+        os.replace(tmp, path)
+
+    @staticmethod
+    def _read_preset(path):
+        if orjson is not None:
+            with open(path, 'rb') as f: return orjson.loads(f.read())
+        with open(path, 'r') as f: return json.load(f)
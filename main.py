@@ -7,10 +7,10 @@
 import sys
 import os
 from PySide6.QtWidgets import QApplication
-from PySide6.QtQml import QQmlApplicationEngine
+from PySide6.QtQml import QQmlApplicationEngine, qmlRegisterType
 from PySide6.QtCore import QUrl
 
-from CameraController import CameraController, LiveImageProvider
+from CameraController import CameraController, LiveImageProvider, LiveView
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
@@ -26,6 +26,9 @@ if __name__ == "__main__":
         print(f"Критическая ошибка инициализации контроллера: {e}")
         sys.exit(-1)
 
+    # Элемент вывода видеопотока напрямую в scene graph (import FlirCamera в QML).
+    qmlRegisterType(LiveView, "FlirCamera", 1, 0, "LiveView")
+
     engine = QQmlApplicationEngine()
     
     # Регистрируем провайдер под именем "live". 
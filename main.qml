@@ -9,6 +9,7 @@ import QtQuick.Layouts
 import QtQuick.Window
 import QtQuick.Dialogs
 import QtQuick.Controls.Material
+import FlirCamera
 
 ApplicationWindow {
     id: window
@@ -35,15 +36,12 @@ ApplicationWindow {
             Layout.fillHeight: true
             color: "black"
 
-            Image {
+            LiveView {
                 id: camView
                 anchors.fill: parent
-                fillMode: Image.PreserveAspectFit
-                // Привязка к провайдеру: при изменении cameraController.imagePath 
-                // изображение автоматически перезапрашивается
-                source: cameraController.imagePath
-                cache: false
-                asynchronous: false
+                // Кадры берутся из провайдера контроллера и загружаются прямо в текстуру
+                // scene graph при каждом сигнале frameChanged (с сохранением пропорций)
+                controller: cameraController
             }
 
             // Заглушка, отображаемая при выключенной камере